@@ -16,31 +16,79 @@ from __future__ import annotations
 
 import argparse
 import datetime as _dt
+import functools
 import gzip
-import hashlib
 import io
+import itertools
 import json
 import os
 import random
 import re
+import shutil
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+import zlib
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Literal, Optional
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # optional: faster JSON parsing straight from bytes
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+if _orjson is not None:
+    _json_loads = _orjson.loads
+    _json_dumps_bytes = _orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(obj) -> bytes:
+        # Same compact, UTF-8 output as orjson.dumps
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+try:  # optional: HTTP/2 transport (pip install "httpx[http2]"), enabled with --http2
+    import httpx as _httpx
+except ImportError:
+    _httpx = None
+
+try:  # optional: C-based HTML parsing for filing index / browse-edgar pages
+    import lxml.html as _lxml_html
+except ImportError:
+    _lxml_html = None
+
+try:  # optional: ISA-L gzip is several times faster than zlib for large indexes
+    from isal import igzip as _gzip
+except ImportError:
+    _gzip = gzip
 
 
 SEC_DATA_BASE = "https://data.sec.gov"
 SEC_ARCHIVES_BASE = "https://www.sec.gov/Archives"
 SEC_BROWSE_BASE = "https://www.sec.gov/cgi-bin/browse-edgar"
-
-
+SEC_EFTS_BASE = "https://efts.sec.gov/LATEST/search-index"
+# Statuses SEC returns when throttling / overloaded; retried with backoff.
+_RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+# EDGAR full-text search (EFTS) only indexes filings from 2001 onward.
+EFTS_EARLIEST_DATE = _dt.date(2001, 1, 1)
+# Compiled once; used for every parsed HTML cell / CIK file.
+_WS_RE = re.compile(r"\s+")
+_CIK_SPLIT_RE = re.compile(r"[\s,]+")
+_SHARD_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+@functools.lru_cache(maxsize=None)
 def normalize_cik(cik: str) -> str:
-    digits = re.sub(r"\D", "", cik or "")
+    raw = (cik or "").strip()
+    # Fast path for already-clean input; otherwise drop every non-digit character.
+    digits = raw if raw.isdecimal() else "".join(ch for ch in raw if ch.isdecimal())
     if not digits:
         raise ValueError(f"Invalid CIK: {cik!r}")
     if len(digits) > 10:
@@ -49,6 +97,7 @@ def normalize_cik(cik: str) -> str:
     return digits.zfill(10)
 
 
+@functools.lru_cache(maxsize=None)
 def cik_to_int_str(cik10: str) -> str:
     # Archives URL uses CIK without leading zeros as directory name
     return str(int(cik10))
@@ -58,6 +107,8 @@ def accession_no_nodashes(accession_no: str) -> str:
     return accession_no.replace("-", "")
 
 
+# Same names (primary docs, exhibit patterns) recur across filings; bounded because the set is open-ended.
+@functools.lru_cache(maxsize=16384)
 def safe_filename(name: str) -> str:
     # SEC filenames are generally safe; still guard against path traversal
     name = name.replace("\\", "/")
@@ -68,23 +119,44 @@ def safe_filename(name: str) -> str:
     return name
 
 
+class _RateBucket:
+    __slots__ = ("lock", "last")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.last = 0.0
+
+
 class RateLimiter:
-    """Simple global min-interval rate limiter shared across threads."""
+    """
+    Min-interval rate limiter shared across threads.
+
+    Each SEC host (data.sec.gov, www.sec.gov, efts.sec.gov) gets its own bucket, so requests
+    to different hosts don't queue behind each other. wait() without a URL uses one shared bucket.
+    """
 
     def __init__(self, min_interval_sec: float):
         self.min_interval_sec = float(min_interval_sec)
         self._lock = threading.Lock()
-        self._last = 0.0
+        self._buckets: dict[str, _RateBucket] = {}
+
+    def _bucket(self, host: str) -> _RateBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(host, _RateBucket())
+        return bucket
 
-    def wait(self) -> None:
+    def wait(self, url: str | None = None) -> None:
         if self.min_interval_sec <= 0:
             return
-        with self._lock:
+        bucket = self._bucket(urlsplit(url).netloc if url else "")
+        with bucket.lock:
             now = time.monotonic()
-            sleep_for = self.min_interval_sec - (now - self._last)
+            sleep_for = self.min_interval_sec - (now - bucket.last)
             if sleep_for > 0:
                 time.sleep(sleep_for)
-            self._last = time.monotonic()
+            bucket.last = time.monotonic()
 
 
 @dataclass(frozen=True)
@@ -94,56 +166,214 @@ class FilingRef:
     filing_date: str
     form: str
     primary_document: str
+    # Derived once per filing instead of on every URL/path build.
+    accession_dir: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "accession_dir", accession_no_nodashes(self.accession_no))
+
+
+def _default_headers(user_agent: str) -> dict[str, str]:
+    # Kept minimal: SEC only requires the User-Agent. Keep-alive is the default in urllib3/httpx
+    # (and "Connection" is not allowed on HTTP/2), and content negotiation is unused.
+    return {"User-Agent": user_agent, "Accept": "*/*"}
+
+
+class _Http2Raw(io.RawIOBase):
+    """File-like view over an httpx byte stream, so shutil.copyfileobj(resp.raw, ...) works unchanged."""
+
+    def __init__(self, resp) -> None:
+        super().__init__()
+        self._chunks = resp.iter_bytes(1024 * 1024)
+        self._buf = b""
+        self.decode_content = True  # httpx always decodes Content-Encoding; kept for API parity
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if not self._buf:
+            self._buf = next(self._chunks, b"")
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+
+class _Http2Response:
+    """The subset of requests.Response used by the sec_* helpers, backed by an httpx response."""
+
+    def __init__(self, resp) -> None:
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.encoding = resp.charset_encoding
+        self._raw: _Http2Raw | None = None
 
     @property
-    def accession_dir(self) -> str:
-        return accession_no_nodashes(self.accession_no)
+    def content(self) -> bytes:
+        return self._resp.read()
+
+    @property
+    def raw(self) -> _Http2Raw:
+        # One wrapper (and one byte iterator) per response, like requests' resp.raw.
+        if self._raw is None:
+            self._raw = _Http2Raw(self._resp)
+        return self._raw
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self._resp.url}", response=None)
 
+    def close(self) -> None:
+        self._resp.close()
 
-def build_session(user_agent: str) -> requests.Session:
+    def __enter__(self) -> "_Http2Response":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _Http2Session:
+    """
+    Optional HTTP/2 transport (httpx + h2) with the requests.Session.get() surface used here.
+
+    Many index/exhibit GETs share one multiplexed TLS connection per host instead of one
+    HTTP/1.1 connection per worker. httpx errors are re-raised as requests exceptions so
+    the existing retry loops handle them unchanged.
+    """
+
+    def __init__(self, user_agent: str, *, pool_size: int = 10) -> None:
+        if _httpx is None:
+            raise RuntimeError('HTTP/2 needs httpx with h2: python -m pip install "httpx[http2]"')
+        try:
+            self._client = _httpx.Client(
+                http2=True,
+                headers=_default_headers(user_agent),
+                limits=_httpx.Limits(
+                    max_keepalive_connections=max(1, int(pool_size)),
+                    max_connections=max(1, int(pool_size)) * 2,
+                ),
+                follow_redirects=True,
+            )
+        except ImportError as e:
+            # httpx is installed but without its "http2" extra (h2)
+            raise RuntimeError('HTTP/2 needs httpx with h2: python -m pip install "httpx[http2]"') from e
+        self.headers = self._client.headers
+
+    def get(self, url: str, *, timeout=None, stream: bool = False, headers=None) -> _Http2Response:
+        connect_sec, read_sec = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        try:
+            req = self._client.build_request(
+                "GET", url, headers=headers, timeout=_httpx.Timeout(read_sec, connect=connect_sec)
+            )
+            resp = self._client.send(req, stream=stream)
+        except _httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except _httpx.HTTPError as e:
+            # e.g. TooManyRedirects / DecodingError: still a RequestException for the retry loops
+            raise requests.exceptions.RequestException(str(e)) from e
+        return _Http2Response(resp)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def build_session(
+    user_agent: str,
+    *,
+    pool_size: int = 10,
+    http2: bool = False,
+) -> requests.Session | _Http2Session:
     if not user_agent or "@" not in user_agent:
         raise ValueError(
             "SEC 要求提供可聯絡的 User-Agent（建議含 email）。例如："
             ' --user-agent "Your Name your.email@example.com"'
         )
+    if http2:
+        return _Http2Session(user_agent, pool_size=pool_size)
     s = requests.Session()
-    s.headers.update(
-        {
-            "User-Agent": user_agent,
-            "Accept": "application/json,text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.8",
-            "Connection": "keep-alive",
-        }
-    )
+    s.headers.update(_default_headers(user_agent))
+    # requests adds "Connection: keep-alive" by default; HTTP/1.1 is persistent without it.
+    s.headers.pop("Connection", None)
+    # Keep-alive pool per SEC host (www.sec.gov / data.sec.gov), large enough that worker threads
+    # never wait on (or discard) connections. No adapter retries: the sec_* helpers retry every
+    # failure (connect errors and throttling statuses) with jittered backoff through the RateLimiter.
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, int(pool_size)), max_retries=0)
+    s.mount("https://", adapter)
     return s
 
 
-def sec_get_json(
+def _sleep_backoff(backoff: float, resp=None) -> float:
+    """
+    Sleep for backoff plus up to 50% jitter (at least SEC's Retry-After seconds, capped at 60);
+    return the next (doubled, capped) backoff.
+    """
+    delay = backoff
+    retry_after = (resp.headers.get("Retry-After") or "").strip() if resp is not None else ""
+    if retry_after.isdecimal():
+        delay = max(delay, min(float(retry_after), 60.0))
+    time.sleep(delay + random.uniform(0, 0.5 * backoff))
+    return min(backoff * 2, 60.0)
+
+
+def _sec_get(
     session: requests.Session,
     url: str,
     *,
     rate_limiter: RateLimiter,
+    parse: Literal["json", "text", "bytes", "response"],
     max_retries: int = 10,
     timeout_sec: float = 60.0,
-) -> dict:
+    headers: dict[str, str] | None = None,
+):
+    """
+    Shared GET with retries/backoff; `parse` selects how the body is returned.
+    The body is read once (resp.content) and parsed from those bytes directly.
+    parse="response" returns the Response itself (for status/headers, e.g. 304 handling).
+    """
     backoff = 1.0
-    for attempt in range(max_retries):
-        rate_limiter.wait()
+    attempts = max(1, int(max_retries))
+    for attempt in range(attempts):
+        rate_limiter.wait(url)
+        last_attempt = attempt + 1 >= attempts
         try:
-            resp = session.get(url, timeout=(10.0, timeout_sec))
+            resp = session.get(url, timeout=(10.0, timeout_sec), headers=headers)
         except requests.exceptions.RequestException:
             # Network hiccup / timeout: backoff and retry
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
+            if not last_attempt:
+                backoff = _sleep_backoff(backoff)
             continue
-        if resp.status_code in (403, 429, 500, 502, 503, 504):
+        if resp.status_code in _RETRY_STATUSES:
             # Respect SEC throttling; exponential backoff.
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
+            resp.close()
+            if not last_attempt:
+                backoff = _sleep_backoff(backoff, resp)
             continue
         resp.raise_for_status()
-        return resp.json()
-    raise RuntimeError(f"Failed to fetch JSON after retries: {url}")
+        if parse == "response":
+            return resp
+        if parse == "json":
+            return _json_loads(resp.content)
+        if parse == "text":
+            return resp.content.decode(resp.encoding or "utf-8", errors="replace")
+        return resp.content
+    raise RuntimeError(f"Failed to fetch {parse} after retries: {url}")
+
+
+def sec_get_json(
+    session: requests.Session,
+    url: str,
+    *,
+    rate_limiter: RateLimiter,
+    max_retries: int = 10,
+    timeout_sec: float = 60.0,
+) -> dict:
+    return _sec_get(
+        session, url, rate_limiter=rate_limiter, parse="json", max_retries=max_retries, timeout_sec=timeout_sec
+    )
+
 
 def sec_get_text(
     session: requests.Session,
@@ -153,23 +383,9 @@ def sec_get_text(
     max_retries: int = 10,
     timeout_sec: float = 60.0,
 ) -> str:
-    backoff = 1.0
-    for attempt in range(max_retries):
-        rate_limiter.wait()
-        try:
-            resp = session.get(url, timeout=(10.0, timeout_sec))
-        except requests.exceptions.RequestException:
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
-            continue
-        if resp.status_code in (403, 429, 500, 502, 503, 504):
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
-            continue
-        resp.raise_for_status()
-        resp.encoding = resp.encoding or "utf-8"
-        return resp.text
-    raise RuntimeError(f"Failed to fetch text after retries: {url}")
+    return _sec_get(
+        session, url, rate_limiter=rate_limiter, parse="text", max_retries=max_retries, timeout_sec=timeout_sec
+    )
 
 
 def sec_get_bytes(
@@ -183,74 +399,86 @@ def sec_get_bytes(
     """
     Fetch raw bytes with retries/backoff. Useful for large index files and .gz.
     """
-    backoff = 1.0
-    for attempt in range(max_retries):
-        rate_limiter.wait()
-        try:
-            resp = session.get(url, timeout=(10.0, timeout_sec))
-        except requests.exceptions.RequestException:
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
-            continue
-        if resp.status_code in (403, 429, 500, 502, 503, 504):
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
-            continue
-        resp.raise_for_status()
-        return resp.content
-    raise RuntimeError(f"Failed to fetch bytes after retries: {url}")
+    return _sec_get(
+        session, url, rate_limiter=rate_limiter, parse="bytes", max_retries=max_retries, timeout_sec=timeout_sec
+    )
 
 
 def sec_download_file(
     session: requests.Session,
     url: str,
-    target_path: Path,
+    target_dir: str,
+    filename: str,
     *,
     rate_limiter: RateLimiter,
     max_retries: int = 10,
     timeout_sec: float = 120.0,
 ) -> None:
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    if target_path.exists() and target_path.stat().st_size > 0:
-        return
+    """
+    Download url to target_dir/filename (skipped if it already exists and is non-empty).
+
+    target_dir must already exist; callers create it once per filing. Plain string paths are
+    used because this runs once per file across every filing.
+    """
+    target_path = os.path.join(target_dir, filename)
+    try:
+        if os.stat(target_path).st_size > 0:
+            return
+    except FileNotFoundError:
+        pass
 
     backoff = 1.0
-    for attempt in range(max_retries):
-        rate_limiter.wait()
+    attempts = max(1, int(max_retries))
+    for attempt in range(attempts):
+        rate_limiter.wait(url)
+        last_attempt = attempt + 1 >= attempts
         try:
             resp = session.get(url, timeout=(10.0, timeout_sec), stream=True)
         except requests.exceptions.RequestException:
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
+            if not last_attempt:
+                backoff = _sleep_backoff(backoff)
             continue
-        if resp.status_code in (403, 429, 500, 502, 503, 504):
-            time.sleep(backoff + random.random())
-            backoff = min(backoff * 2, 60.0)
-            continue
-        # Some older accession directories have index listings that reference missing files.
-        # Treat 404 as a skip so one missing file doesn't fail the whole filing.
-        if resp.status_code == 404:
-            return
-        resp.raise_for_status()
-
-        tmp_path = target_path.with_suffix(target_path.suffix + ".part")
-        with open(tmp_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=1024 * 256):
-                if chunk:
-                    f.write(chunk)
+        # Streamed responses hold their pooled connection until closed, including the
+        # retry/404/error paths that never read the body.
+        with resp:
+            if resp.status_code in _RETRY_STATUSES:
+                if not last_attempt:
+                    backoff = _sleep_backoff(backoff, resp)
+                continue
+            # Some older accession directories have index listings that reference missing files.
+            # Treat 404 as a skip so one missing file doesn't fail the whole filing.
+            if resp.status_code == 404:
+                return
+            resp.raise_for_status()
+
+            tmp_path = target_path + ".part"
+            # Copy straight from the urllib3 stream in 1 MiB blocks (less per-chunk overhead than iter_content).
+            resp.raw.decode_content = True
+            with open(tmp_path, "wb") as f:
+                if hasattr(os, "posix_fadvise"):
+                    # Linux/Unix hint: the file is written once front-to-back.
+                    try:
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass
+                shutil.copyfileobj(resp.raw, f, length=1024 * 1024)
         os.replace(tmp_path, target_path)
         return
 
     raise RuntimeError(f"Failed to download after retries: {url}")
 
 
-def iter_ciks_from_file(path: Path) -> list[str]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
+def split_ciks_text(text: str) -> list[str]:
     # allow comma/space/newline separated
-    toks = re.split(r"[\s,]+", text.strip())
+    toks = _CIK_SPLIT_RE.split((text or "").strip())
     return [t for t in toks if t]
 
 
+def iter_ciks_from_file(path: Path) -> list[str]:
+    return split_ciks_text(path.read_text(encoding="utf-8", errors="ignore"))
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_date_yyyy_mm_dd(s: str) -> _dt.date:
     """
     Accept 'YYYY-MM-DD' or 'YYYY/MM/DD' and return date.
@@ -278,48 +506,50 @@ def _current_year_quarter(today: _dt.date | None = None) -> tuple[int, int]:
     return d.year, int(q)
 
 
-def _iter_year_quarters(start_year: int, end_year: int, end_quarter: int) -> list[tuple[int, int]]:
+def _iter_year_quarters(
+    start_year: int,
+    end_year: int,
+    end_quarter: int,
+    start_quarter: int = 1,
+) -> list[tuple[int, int]]:
     out: list[tuple[int, int]] = []
     for y in range(int(start_year), int(end_year) + 1):
         for q in (1, 2, 3, 4):
+            if y == start_year and q < int(start_quarter):
+                continue
             if y == end_year and q > int(end_quarter):
                 break
             out.append((y, q))
     return out
 
 
-_MASTER_IDX_ACC_RE = re.compile(r"\b(\d{10}-\d{2}-\d{6})\.txt\b", re.IGNORECASE)
-
-
 def write_targets_manifest(path: Path, targets: list[FilingRef]) -> None:
     """
     Write FilingRef list as JSON Lines for resume/sharding.
     """
-    with open(path, "w", encoding="utf-8") as f:
+    with open(path, "wb", buffering=1 << 20) as f:
+        write = f.write
         for t in targets:
-            f.write(
-                json.dumps(
+            write(
+                _json_dumps_bytes(
                     {
                         "cik10": t.cik10,
                         "accession_no": t.accession_no,
                         "filing_date": t.filing_date,
                         "form": t.form,
-                    },
-                    ensure_ascii=False,
+                    }
                 )
-                + "\n"
             )
+            write(b"\n")
 
 
 def read_targets_manifest(path: Path) -> list[FilingRef]:
     out: list[FilingRef] = []
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    for ln in text.splitlines():
-        ln = ln.strip()
-        if not ln:
+    for ln in path.read_bytes().splitlines():
+        if not ln.strip():
             continue
         try:
-            obj = json.loads(ln)
+            obj = _json_loads(ln)
         except Exception:
             continue
         cik10 = normalize_cik(str(obj.get("cik10") or ""))
@@ -341,6 +571,168 @@ def read_targets_manifest(path: Path) -> list[FilingRef]:
     return out
 
 
+def _write_cache_file(path: Path, data: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".part")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache is best-effort; a failed write only costs a re-download next run.
+        pass
+
+
+def _fetch_master_index(
+    session: requests.Session,
+    year: int,
+    qtr: int,
+    *,
+    rate_limiter: RateLimiter,
+    cache_dir: Path | None = None,
+    closed: bool = False,
+) -> bytes | None:
+    """
+    Return the decompressed master.idx bytes for one quarter, or None if unavailable.
+
+    When cache_dir is given the decompressed index is kept at {cache_dir}/{year}/QTR{qtr}/master.idx,
+    with the response validators (ETag / Last-Modified) in master.idx.meta.json next to it:
+    - closed quarters (immutable) cached after they closed are reused without any request
+    - otherwise the cached copy is revalidated; a 304 reuses it with zero body bytes transferred
+    """
+    cache_path: Path | None = None
+    meta_path: Path | None = None
+    cached: bytes | None = None
+    meta: dict = {}
+    if cache_dir is not None:
+        cache_path = cache_dir / str(year) / f"QTR{qtr}" / "master.idx"
+        meta_path = cache_path.with_name("master.idx.meta.json")
+        try:
+            cached = cache_path.read_bytes() or None
+        except OSError:
+            cached = None
+        try:
+            meta = _json_loads(meta_path.read_bytes())
+        except Exception:
+            meta = {}
+        # Entries without meta were only ever written for closed quarters.
+        if cached and closed and meta.get("complete", True):
+            return cached
+
+    def _remember(url: str, resp: requests.Response, data: bytes | None) -> None:
+        if cache_path is None or meta_path is None:
+            return
+        # A 304 (data is None) may omit validators; keep the ones we already had.
+        prev = meta if data is None else {}
+        if data is not None:
+            _write_cache_file(cache_path, data)
+        new_meta = {
+            "url": url,
+            "etag": resp.headers.get("ETag") or prev.get("etag") or "",
+            "last_modified": resp.headers.get("Last-Modified") or prev.get("last_modified") or "",
+            "complete": bool(closed),
+        }
+        _write_cache_file(meta_path, _json_dumps_bytes(new_meta))
+
+    # Revalidate the cached copy against the URL it came from.
+    if cached and meta.get("url") and (meta.get("etag") or meta.get("last_modified")):
+        url = str(meta["url"])
+        cond_headers = {}
+        if meta.get("etag"):
+            cond_headers["If-None-Match"] = str(meta["etag"])
+        if meta.get("last_modified"):
+            cond_headers["If-Modified-Since"] = str(meta["last_modified"])
+        try:
+            resp = _sec_get(
+                session, url, rate_limiter=rate_limiter, parse="response", timeout_sec=120.0, headers=cond_headers
+            )
+            if resp.status_code == 304:
+                _remember(url, resp, None)
+                return cached
+            data = resp.content
+            if url.endswith(".gz"):
+                data = _gzip.decompress(data)
+            if data:
+                _remember(url, resp, data)
+                return data
+        except Exception:
+            pass
+
+    base = f"{SEC_ARCHIVES_BASE}/edgar/full-index/{year}/QTR{qtr}"
+    # Prefer master.gz (~6x smaller on the wire); fall back to plain master.idx.
+    for name in ("master.gz", "master.idx"):
+        url = f"{base}/{name}"
+        try:
+            resp = _sec_get(session, url, rate_limiter=rate_limiter, parse="response", timeout_sec=120.0)
+            data = resp.content
+            if name.endswith(".gz"):
+                data = _gzip.decompress(data)
+        except Exception:
+            continue
+        if data:
+            _remember(url, resp, data)
+            return data
+    # Network unavailable: a stale cached copy is still better than skipping the quarter.
+    return cached
+
+
+def _parse_master_index(
+    data: bytes,
+    *,
+    wanted_forms_b: set[bytes],
+    cik_filter_b: set[bytes] | None,
+    start_dt: _dt.date | None,
+) -> list[FilingRef]:
+    # master.idx is ASCII; parse the raw bytes and only decode the fields we keep.
+    lines = data.splitlines()
+    start_b = start_dt.isoformat().encode("ascii") if start_dt else None
+
+    # Skip header until the pipe header line
+    start_i = 0
+    for i, ln in enumerate(lines[:200]):
+        if ln.strip().upper().startswith(b"CIK|COMPANY NAME|FORM TYPE|DATE FILED|FILENAME"):
+            start_i = i + 1
+            break
+
+    out: list[FilingRef] = []
+    for ln in itertools.islice(lines, start_i, None):
+        parts = ln.split(b"|", 5)
+        if len(parts) < 5:
+            continue
+        form_b = parts[2].strip()
+        if form_b not in wanted_forms_b:
+            continue
+
+        cik_b = parts[0].strip()
+        if not cik_b.isdigit():
+            continue
+        cik_b = cik_b[-10:].zfill(10)
+        if cik_filter_b and cik_b not in cik_filter_b:
+            continue
+
+        # Dates are fixed-width YYYY-MM-DD, so a byte-wise compare is a date compare.
+        date_b = parts[3].strip()
+        if len(date_b) != 10 or date_b[4:5] != b"-" or date_b[7:8] != b"-":
+            continue
+        if start_b and date_b < start_b:
+            continue
+
+        # Accession is the basename of the filename column: edgar/data/{cik}/{accession}.txt
+        acc_b = parts[4].strip().rsplit(b"/", 1)[-1]
+        if len(acc_b) != 24 or acc_b[-4:].lower() != b".txt" or acc_b[10:11] != b"-" or acc_b[13:14] != b"-":
+            continue
+
+        out.append(
+            FilingRef(
+                cik10=cik_b.decode("ascii"),
+                accession_no=acc_b[:-4].decode("ascii"),
+                filing_date=date_b.decode("ascii"),
+                form=form_b.decode("ascii"),
+                primary_document="",
+            )
+        )
+    return out
+
+
 def collect_10k_from_master_index(
     session: requests.Session,
     *,
@@ -349,102 +741,66 @@ def collect_10k_from_master_index(
     start_date: str | None,
     include_amendments: bool,
     rate_limiter: RateLimiter,
+    executor: Executor | None = None,
+    cache_dir: Path | None = None,
 ) -> list[FilingRef]:
     """
     Use SEC quarterly master index to list filings in bulk (\"season\"/quarterly mode).
 
-    - Source: https://www.sec.gov/Archives/edgar/full-index/{year}/QTR{q}/master.idx
-      (fallback to master.gz)
+    - Source: https://www.sec.gov/Archives/edgar/full-index/{year}/QTR{q}/master.gz
+      (fallback to master.idx)
     - Filter: 10-K and optionally 10-K/A
     - If cik_filter is provided, only keep those CIKs (10-digit form).
+    - If executor is provided, quarters are fetched concurrently on it (rate_limiter still
+      caps the request rate; this only removes the idle round-trip gap between quarters).
+    - If cache_dir is provided, indexes are cached there: closed quarters are reused without a
+      request, and the current quarter is revalidated with If-None-Match / If-Modified-Since.
 
     Returns FilingRef list (primary_document empty; download uses filing index HTML).
     """
     start_dt = _parse_date_yyyy_mm_dd(start_date) if start_date else None
     end_year, end_q = _current_year_quarter()
-    quarters = _iter_year_quarters(int(start_year), int(end_year), int(end_q))
+    first_year, first_q = int(start_year), 1
+    if start_dt:
+        # Quarters wholly before start_date cannot contribute rows; don't fetch them.
+        first_year, first_q = max((first_year, first_q), _current_year_quarter(start_dt))
+    quarters = _iter_year_quarters(first_year, int(end_year), int(end_q), start_quarter=first_q)
 
     wanted_forms = {"10-K"}
     if include_amendments:
         wanted_forms.add("10-K/A")
-
-    out: list[FilingRef] = []
-    for year, qtr in quarters:
-        base = f"{SEC_ARCHIVES_BASE}/edgar/full-index/{year}/QTR{qtr}"
-        # Try plain master.idx first; fallback to master.gz (some environments prefer gz).
-        data: bytes | None = None
-        for name in ("master.idx", "master.gz"):
-            url = f"{base}/{name}"
-            try:
-                data = sec_get_bytes(session, url, rate_limiter=rate_limiter)
-                if name.endswith(".gz"):
-                    data = gzip.decompress(data)
-                break
-            except Exception:
-                data = None
-                continue
+    # Row filtering is done on raw bytes, so pre-encode the lookup sets once.
+    wanted_forms_b = {f.encode("ascii") for f in wanted_forms}
+    cik_filter_b = {c.encode("ascii") for c in cik_filter} if cik_filter else None
+
+    def _fetch_and_parse_quarter(year_qtr: tuple[int, int]) -> list[FilingRef]:
+        data = _fetch_master_index(
+            session,
+            *year_qtr,
+            rate_limiter=rate_limiter,
+            cache_dir=cache_dir,
+            # The current quarter is still being appended to; it is always revalidated.
+            closed=year_qtr != (end_year, end_q),
+        )
         if not data:
-            continue
-
-        # master.idx is ASCII; decode with replacement to be robust
-        text = data.decode("latin-1", errors="replace")
-        lines = text.splitlines()
-
-        # Skip header until the pipe header line
-        start_i = 0
-        for i, ln in enumerate(lines[:200]):
-            if ln.strip().upper().startswith("CIK|COMPANY NAME|FORM TYPE|DATE FILED|FILENAME"):
-                start_i = i + 1
-                break
-
-        for ln in lines[start_i:]:
-            if not ln or "|" not in ln:
-                continue
-            parts = ln.split("|")
-            if len(parts) < 5:
-                continue
-            cik_raw, _company, form, date_filed, filename = parts[0].strip(), parts[1], parts[2].strip(), parts[3].strip(), parts[4].strip()
-            if form not in wanted_forms:
-                continue
-
-            dt = _try_parse_date_yyyy_mm_dd(date_filed)
-            if not dt:
-                continue
-            if start_dt and dt < start_dt:
-                continue
-
-            try:
-                cik10 = normalize_cik(cik_raw)
-            except Exception:
-                continue
-            if cik_filter and cik10 not in cik_filter:
-                continue
-
-            m = _MASTER_IDX_ACC_RE.search(filename)
-            if not m:
-                continue
-            accession_no = m.group(1)
-
-            out.append(
-                FilingRef(
-                    cik10=cik10,
-                    accession_no=accession_no,
-                    filing_date=date_filed,
-                    form=form,
-                    primary_document="",
-                )
-            )
+            return []
+        return _parse_master_index(
+            data, wanted_forms_b=wanted_forms_b, cik_filter_b=cik_filter_b, start_dt=start_dt
+        )
 
-    # de-dup by accession (master index can contain duplicates across corrections)
+    # map() keeps quarter order, so the first-seen de-dup stays deterministic.
+    mapper = executor.map if executor is not None else map
+    # de-dup by accession while merging (master index can contain duplicates across corrections)
     seen: set[str] = set()
-    deduped: list[FilingRef] = []
-    for r in out:
-        if r.accession_no in seen:
-            continue
-        seen.add(r.accession_no)
-        deduped.append(r)
-    deduped.sort(key=lambda x: (x.filing_date, x.accession_no))
-    return deduped
+    out: list[FilingRef] = []
+    for refs in mapper(_fetch_and_parse_quarter, quarters):
+        for r in refs:
+            if r.accession_no in seen:
+                continue
+            seen.add(r.accession_no)
+            out.append(r)
+    out.sort(key=lambda x: (x.filing_date, x.accession_no))
+    return out
 
 
 def run_download(
@@ -454,7 +810,7 @@ def run_download(
     user_agent: str,
     include_amendments: bool = False,
     min_interval: float = 0.2,
-    max_workers: int = 3,
+    max_workers: int = 8,
     save_manifest: bool = False,
     download_mode: str = "all",
     start_date: str | None = None,
@@ -464,6 +820,7 @@ def run_download(
     targets_manifest: str | Path | None = None,
     reuse_targets_manifest: bool = False,
     manifest_only: bool = False,
+    http2: bool = False,
     log: Optional[Callable[[str], None]] = None,
 ) -> dict:
     """
@@ -491,78 +848,97 @@ def run_download(
         raise ValueError(f"Unknown source_mode: {source_mode}")
 
     out_dir = Path(out)
-    session = build_session(user_agent)
+    workers = max(1, int(max_workers))
+    session = build_session(user_agent, pool_size=workers * 2, http2=bool(http2))
     rate_limiter = RateLimiter(min_interval)
 
     total_targets = 0
     ok = 0
     failed = 0
 
-    # ---- master index mode (season/quarter batch) ----
-    if source_mode == "master_index":
-        manifest_path: Path
-        if targets_manifest:
-            manifest_path = Path(targets_manifest)
-        else:
-            sd = (start_date or "all").replace("/", "-")
+    # One worker pool for the whole run (reused across companies instead of one per CIK).
+    # Workers mostly wait on the network, so several filings' index + exhibit requests overlap
+    # and the per-host RateLimiter, not the thread count, is what caps throughput.
+    # Files within a filing go to a second pool: filing tasks wait on file tasks, so sharing
+    # one pool could deadlock once every worker is a waiting filing.
+    with ThreadPoolExecutor(max_workers=workers) as ex, ThreadPoolExecutor(max_workers=workers) as file_ex:
+        # ---- master index mode (season/quarter batch) ----
+        if source_mode == "master_index":
+            manifest_path: Path
             shard_tag = (shard or "all").replace("/", "_")
-            manifest_path = out_dir / f"master_index_10k_targets_{sd}_{shard_tag}.jsonl"
-
-        if reuse_targets_manifest and manifest_path.exists():
-            _log(f"MASTER_INDEX mode: loading targets from manifest {manifest_path} ...")
-            targets = read_targets_manifest(manifest_path)
-        else:
-            _log("MASTER_INDEX mode: building 10-K targets from quarterly index ...")
-            targets = collect_10k_from_master_index(
-                session,
-                cik_filter=set(ciks10),
-                start_year=int(master_start_year),
-                start_date=start_date,
-                include_amendments=include_amendments,
-                rate_limiter=rate_limiter,
-            )
-        # Optional sharding for multi-machine runs: keep only a slice of accessions.
-        if shard:
-            m = re.match(r"^\s*(\d+)\s*/\s*(\d+)\s*$", shard)
-            if not m:
-                raise ValueError("Invalid --shard format. Use N/K, e.g. 1/3")
-            n = int(m.group(1))
-            k = int(m.group(2))
-            if k <= 0 or n <= 0 or n > k:
-                raise ValueError("Invalid --shard values. Must satisfy 1 <= N <= K and K > 0")
-            before = len(targets)
-            targets = [
-                t
-                for t in targets
-                if (int(hashlib.sha1(t.accession_no.encode("utf-8")).hexdigest(), 16) % k) == (n - 1)
-            ]
-            _log(f"MASTER_INDEX shard={n}/{k} targets={len(targets)}/{before}")
-        # Always write manifest for resume/debugging
-        try:
-            manifest_path.parent.mkdir(parents=True, exist_ok=True)
-            write_targets_manifest(manifest_path, targets)
-            _log(f"MASTER_INDEX wrote manifest: {manifest_path}")
-        except Exception as e:
-            _log(f"MASTER_INDEX manifest write failed: {e}")
-
-        total_targets = len(targets)
-        _log(f"MASTER_INDEX targets={total_targets}")
-
-        if manifest_only:
-            _log("MASTER_INDEX manifest-only: skip downloads.")
-            return {
-                "ok": 0,
-                "failed": 0,
-                "total": total_targets,
-                "companies_total": len(ciks10),
-                "companies_done": len(ciks10),
-                "companies_failed": 0,
-                "out": str(out_dir.resolve()),
-            }
+            if targets_manifest:
+                manifest_path = Path(targets_manifest)
+            else:
+                sd = (start_date or "all").replace("/", "-")
+                manifest_path = out_dir / f"master_index_10k_targets_{sd}_{shard_tag}.jsonl"
+
+            reused_manifest = False
+            if reuse_targets_manifest and manifest_path.exists():
+                _log(f"MASTER_INDEX mode: loading targets from manifest {manifest_path} ...")
+                targets = read_targets_manifest(manifest_path)
+                reused_manifest = True
+            else:
+                _log("MASTER_INDEX mode: building 10-K targets from quarterly index ...")
+                targets = collect_10k_from_master_index(
+                    session,
+                    cik_filter=set(ciks10),
+                    start_year=int(master_start_year),
+                    start_date=start_date,
+                    include_amendments=include_amendments,
+                    rate_limiter=rate_limiter,
+                    executor=ex,
+                    cache_dir=out_dir / ".cache" / "full-index",
+                )
+            # Optional sharding for multi-machine runs: keep only a slice of accessions.
+            # A reused manifest named for this shard is already that slice; don't filter it again
+            # (older manifests were sharded by SHA-1, and re-filtering would drop most of them).
+            if shard and reused_manifest and manifest_path.name.endswith(f"_{shard_tag}.jsonl"):
+                _log(f"MASTER_INDEX shard={shard.strip()} reused manifest already sharded, targets={len(targets)}")
+            elif shard:
+                m = _SHARD_RE.match(shard)
+                if not m:
+                    raise ValueError("Invalid --shard format. Use N/K, e.g. 1/3")
+                n = int(m.group(1))
+                k = int(m.group(2))
+                if k <= 0 or n <= 0 or n > k:
+                    raise ValueError("Invalid --shard values. Must satisfy 1 <= N <= K and K > 0")
+                before = len(targets)
+                # CRC32 is deterministic across machines/processes (unlike hash()) and far cheaper than SHA-1.
+                targets = [t for t in targets if (zlib.crc32(t.accession_no.encode("utf-8")) % k) == (n - 1)]
+                _log(f"MASTER_INDEX shard={n}/{k} targets={len(targets)}/{before}")
+                if reused_manifest and len(targets) < before:
+                    _log(
+                        f"MASTER_INDEX warning: shard filter dropped {before - len(targets)} targets from the reused "
+                        "manifest; if it was built by a version that sharded with SHA-1, rebuild it without "
+                        "--reuse-targets-manifest"
+                    )
+            # Write manifest for resume/debugging. A reused manifest is left as it was: overwriting it
+            # with the shard-filtered subset would lose the other targets for good.
+            if not reused_manifest:
+                try:
+                    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+                    write_targets_manifest(manifest_path, targets)
+                    _log(f"MASTER_INDEX wrote manifest: {manifest_path}")
+                except Exception as e:
+                    _log(f"MASTER_INDEX manifest write failed: {e}")
+
+            total_targets = len(targets)
+            _log(f"MASTER_INDEX targets={total_targets}")
+
+            if manifest_only:
+                _log("MASTER_INDEX manifest-only: skip downloads.")
+                return {
+                    "ok": 0,
+                    "failed": 0,
+                    "total": total_targets,
+                    "companies_total": len(ciks10),
+                    "companies_done": len(ciks10),
+                    "companies_failed": 0,
+                    "out": str(out_dir.resolve()),
+                }
 
-        if targets:
-            _log(f"Downloading {len(targets)} filings ...")
-            with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as ex:
+            if targets:
+                _log(f"Downloading {len(targets)} filings ...")
                 futs = [
                     ex.submit(
                         download_filing,
@@ -572,6 +948,7 @@ def run_download(
                         rate_limiter=rate_limiter,
                         save_manifest=bool(save_manifest),
                         download_mode=download_mode,
+                        executor=file_ex,
                     )
                     for filing in targets
                 ]
@@ -583,74 +960,135 @@ def run_download(
                     except Exception as e:
                         failed += 1
                         _log(f"FAIL {e}")
-        else:
-            _log("No targets found. Done.")
-
-        _log(f"Done. ok={ok} failed={failed} targets={total_targets} out={out_dir.resolve()}")
-        return {
-            "ok": ok,
-            "failed": failed,
-            "total": total_targets,
-            "companies_total": len(ciks10),
-            "companies_done": len(ciks10),
-            "companies_failed": 0,
-            "out": str(out_dir.resolve()),
-        }
+            else:
+                _log("No targets found. Done.")
 
-    # ---- per-company mode (existing) ----
-    total_companies = len(ciks10)
-    companies_done = 0
-    companies_failed = 0
-
-    for idx, cik10 in enumerate(ciks10, start=1):
-        _log(f"[{idx}/{total_companies}] {cik10} SCAN start")
-        # Speed strategy for large CIK sets:
-        # - Prefer submissions JSON when it already covers the requested start_date (typically fewer requests).
-        # - Fall back to browse-edgar when submissions appears too shallow (some issuers miss older years there).
-        if start_date:
-            start_dt = _parse_date_yyyy_mm_dd(start_date)
-            filings = collect_all_filings_for_cik(session, cik10, rate_limiter=rate_limiter)
-            sub_targets = filter_10k_filings(cik10, filings, include_amendments=include_amendments)
-            sub_targets = [
-                t
-                for t in sub_targets
-                if (_try_parse_date_yyyy_mm_dd(t.filing_date) or _dt.date.max) >= start_dt
-            ]
-            sub_earliest = min(
-                (d for d in (_try_parse_date_yyyy_mm_dd(t.filing_date) for t in sub_targets) if d),
-                default=None,
-            )
-            if sub_earliest and sub_earliest <= start_dt:
-                targets = sub_targets
-                _log(f"[{idx}/{total_companies}] {cik10} source=submissions earliest={sub_earliest.isoformat()}")
+            _log(f"Done. ok={ok} failed={failed} targets={total_targets} out={out_dir.resolve()}")
+            return {
+                "ok": ok,
+                "failed": failed,
+                "total": total_targets,
+                "companies_total": len(ciks10),
+                "companies_done": len(ciks10),
+                "companies_failed": 0,
+                "out": str(out_dir.resolve()),
+            }
+
+        # ---- per-company mode (existing) ----
+        total_companies = len(ciks10)
+        companies_done = 0
+        companies_failed = 0
+
+        # Downloads for company N keep running while company N+1 is scanned.
+        # pending maps cik10 -> (idx, futures); companies are reported in input order.
+        pending: dict[str, tuple[int, list[Future]]] = {}
+
+        def _finish_companies(block: bool) -> None:
+            nonlocal ok, failed, companies_done, companies_failed
+            for cik10, (idx, futs) in list(pending.items()):
+                if not block and not all(f.done() for f in futs):
+                    break
+                cik_ok = 0
+                cik_failed = 0
+                for fut in as_completed(futs):
+                    try:
+                        filing, count = fut.result()
+                        ok += 1
+                        cik_ok += 1
+                        _log(f"OK  {filing.cik10} {filing.filing_date} {filing.accession_no} files={count}")
+                    except Exception as e:
+                        failed += 1
+                        cik_failed += 1
+                        _log(f"FAIL {e}")
+                del pending[cik10]
+
+                companies_done += 1
+                if cik_failed > 0:
+                    companies_failed += 1
+
+                _log(
+                    f"[{idx}/{total_companies}] {cik10} COMPANY_DONE ok={cik_ok} failed={cik_failed} "
+                    f"companies_done={companies_done} companies_left={total_companies - companies_done}"
+                )
+
+        for idx, cik10 in enumerate(ciks10, start=1):
+            _log(f"[{idx}/{total_companies}] {cik10} SCAN start")
+            # Speed strategy for large CIK sets:
+            # - Prefer submissions JSON when it already covers the requested start_date (typically fewer requests).
+            # - Fall back to browse-edgar when submissions appears too shallow (some issuers miss older years there).
+            if start_date:
+                start_dt = _parse_date_yyyy_mm_dd(start_date)
+                filings = collect_all_filings_for_cik(session, cik10, rate_limiter=rate_limiter)
+                sub_targets = filter_10k_filings(cik10, filings, include_amendments=include_amendments)
+                sub_targets = [
+                    t
+                    for t in sub_targets
+                    if (_try_parse_date_yyyy_mm_dd(t.filing_date) or _dt.date.max) >= start_dt
+                ]
+                # Coverage is judged on every submissions row (any form), before the start_date filter:
+                # submissions covers the range when its history reaches back to start_dt.
+                sub_earliest = min(
+                    (d for d in (_try_parse_date_yyyy_mm_dd(f.get("filingDate") or "") for f in filings) if d),
+                    default=None,
+                )
+                if sub_earliest and sub_earliest <= start_dt:
+                    targets = sub_targets
+                    _log(f"[{idx}/{total_companies}] {cik10} source=submissions earliest={sub_earliest.isoformat()}")
+                else:
+                    # browse-edgar lists up to 100 filings per request (usually one page per form),
+                    # while EFTS returns one hit per document, so it costs more requests per CIK.
+                    # EFTS (2001+) is only a fallback for when browse-edgar itself fails.
+                    try:
+                        targets = collect_10k_targets_for_cik(
+                            session,
+                            cik10,
+                            include_amendments=include_amendments,
+                            rate_limiter=rate_limiter,
+                            start_date=start_date,
+                        )
+                        _log(f"[{idx}/{total_companies}] {cik10} source=browse-edgar")
+                    except Exception as e:
+                        if start_dt < EFTS_EARLIEST_DATE:
+                            raise
+                        _log(f"[{idx}/{total_companies}] {cik10} browse-edgar failed ({e}), trying efts")
+                        efts_targets: list[FilingRef] = []
+                        try:
+                            efts_targets = collect_10k_targets_from_efts(
+                                session,
+                                cik10,
+                                include_amendments=include_amendments,
+                                rate_limiter=rate_limiter,
+                                start_date=start_date,
+                            )
+                        except Exception as e_efts:
+                            _log(f"[{idx}/{total_companies}] {cik10} efts failed ({e_efts})")
+                        # An empty EFTS result is a miss too, not "no 10-Ks".
+                        if not efts_targets:
+                            raise e
+                        # Keep submissions rows (they carry primaryDocument) and add what EFTS found beyond them.
+                        merged = {t.accession_no: t for t in efts_targets}
+                        merged.update({t.accession_no: t for t in sub_targets})
+                        targets = sorted(merged.values(), key=lambda x: (x.filing_date, x.accession_no))
+                        _log(f"[{idx}/{total_companies}] {cik10} source=efts")
             else:
+                # Full history mode
                 targets = collect_10k_targets_for_cik(
                     session,
                     cik10,
                     include_amendments=include_amendments,
                     rate_limiter=rate_limiter,
-                    start_date=start_date,
+                    start_date=None,
                 )
-                _log(f"[{idx}/{total_companies}] {cik10} source=browse-edgar")
-        else:
-            # Full history mode
-            targets = collect_10k_targets_for_cik(
-                session,
-                cik10,
-                include_amendments=include_amendments,
-                rate_limiter=rate_limiter,
-                start_date=None,
-            )
-        total_targets += len(targets)
-        _log(f"[{idx}/{total_companies}] {cik10} 10-K targets={len(targets)}")
-
-        cik_ok = 0
-        cik_failed = 0
+            total_targets += len(targets)
+            _log(f"[{idx}/{total_companies}] {cik10} 10-K targets={len(targets)}")
 
-        if targets:
-            _log(f"[{idx}/{total_companies}] {cik10} Downloading {len(targets)} filings ...")
-            with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as ex:
-                futs = [
+            if targets:
+                _log(f"[{idx}/{total_companies}] {cik10} Downloading {len(targets)} filings ...")
+            else:
+                _log(f"[{idx}/{total_companies}] {cik10} no 10-K targets, skip download")
+            pending[cik10] = (
+                idx,
+                [
                     ex.submit(
                         download_filing,
                         session,
@@ -659,30 +1097,14 @@ def run_download(
                         rate_limiter=rate_limiter,
                         save_manifest=bool(save_manifest),
                         download_mode=download_mode,
+                        executor=file_ex,
                     )
                     for filing in targets
-                ]
-                for fut in as_completed(futs):
-                    try:
-                        filing, count = fut.result()
-                        ok += 1
-                        cik_ok += 1
-                        _log(f"OK  {filing.cik10} {filing.filing_date} {filing.accession_no} files={count}")
-                    except Exception as e:
-                        failed += 1
-                        cik_failed += 1
-                        _log(f"FAIL {e}")
-        else:
-            _log(f"[{idx}/{total_companies}] {cik10} no 10-K targets, skip download")
-
-        companies_done += 1
-        if cik_failed > 0:
-            companies_failed += 1
+                ],
+            )
+            _finish_companies(block=False)
 
-        _log(
-            f"[{idx}/{total_companies}] {cik10} COMPANY_DONE ok={cik_ok} failed={cik_failed} "
-            f"companies_done={companies_done} companies_left={total_companies - companies_done}"
-        )
+        _finish_companies(block=True)
 
     _log(f"Done. ok={ok} failed={failed} companies={total_companies} out={out_dir.resolve()}")
     return {
@@ -696,6 +1118,19 @@ def run_download(
     }
 
 
+def _submissions_rows(cols: dict) -> list[dict]:
+    # Submissions JSON is columnar arrays; zip() stops at the shortest column.
+    return [
+        {"form": form, "accessionNumber": acc, "filingDate": date, "primaryDocument": primary}
+        for form, acc, date, primary in zip(
+            cols.get("form") or [],
+            cols.get("accessionNumber") or [],
+            cols.get("filingDate") or [],
+            cols.get("primaryDocument") or [],
+        )
+    ]
+
+
 def collect_all_filings_for_cik(
     session: requests.Session,
     cik10: str,
@@ -706,25 +1141,7 @@ def collect_all_filings_for_cik(
     url = f"{SEC_DATA_BASE}/submissions/CIK{cik10}.json"
     root = sec_get_json(session, url, rate_limiter=rate_limiter)
 
-    filings: list[dict] = []
-
-    recent = (root.get("filings") or {}).get("recent") or {}
-    # recent is columnar arrays
-    forms = recent.get("form") or []
-    accession_numbers = recent.get("accessionNumber") or []
-    filing_dates = recent.get("filingDate") or []
-    primary_docs = recent.get("primaryDocument") or []
-
-    n = min(len(forms), len(accession_numbers), len(filing_dates), len(primary_docs))
-    for i in range(n):
-        filings.append(
-            {
-                "form": forms[i],
-                "accessionNumber": accession_numbers[i],
-                "filingDate": filing_dates[i],
-                "primaryDocument": primary_docs[i],
-            }
-        )
+    filings = _submissions_rows((root.get("filings") or {}).get("recent") or {})
 
     # Older filings are paged in filings.files; each 'name' is a JSON under /submissions/
     files = (root.get("filings") or {}).get("files") or []
@@ -734,21 +1151,8 @@ def collect_all_filings_for_cik(
             continue
         page_url = f"{SEC_DATA_BASE}/submissions/{name}"
         page = sec_get_json(session, page_url, rate_limiter=rate_limiter)
-        page_recent = (page.get("filings") or {}).get("recent") or {}
-        forms = page_recent.get("form") or []
-        accession_numbers = page_recent.get("accessionNumber") or []
-        filing_dates = page_recent.get("filingDate") or []
-        primary_docs = page_recent.get("primaryDocument") or []
-        n = min(len(forms), len(accession_numbers), len(filing_dates), len(primary_docs))
-        for i in range(n):
-            filings.append(
-                {
-                    "form": forms[i],
-                    "accessionNumber": accession_numbers[i],
-                    "filingDate": filing_dates[i],
-                    "primaryDocument": primary_docs[i],
-                }
-            )
+        # Paged files carry the columns at the top level (no filings.recent wrapper).
+        filings.extend(_submissions_rows((page.get("filings") or {}).get("recent") or page))
 
     return filings
 
@@ -760,6 +1164,7 @@ def filter_10k_filings(
     include_amendments: bool,
 ) -> list[FilingRef]:
     out: list[FilingRef] = []
+    seen: set[str] = set()  # de-dup by accession
     for f in filings:
         form = (f.get("form") or "").strip()
         if not form:
@@ -768,8 +1173,9 @@ def filter_10k_filings(
             acc = f.get("accessionNumber")
             filing_date = f.get("filingDate") or "unknown-date"
             primary = f.get("primaryDocument") or ""
-            if not acc:
+            if not acc or acc in seen:
                 continue
+            seen.add(acc)
             out.append(
                 FilingRef(
                     cik10=cik10,
@@ -779,17 +1185,9 @@ def filter_10k_filings(
                     primary_document=primary,
                 )
             )
-    # de-dup by accession
-    seen: set[str] = set()
-    deduped: list[FilingRef] = []
-    for r in out:
-        if r.accession_no in seen:
-            continue
-        seen.add(r.accession_no)
-        deduped.append(r)
     # sort by date ascending for deterministic output
-    deduped.sort(key=lambda x: (x.filing_date, x.accession_no))
-    return deduped
+    out.sort(key=lambda x: (x.filing_date, x.accession_no))
+    return out
 
 
 def collect_10k_targets_for_cik(
@@ -816,6 +1214,7 @@ def collect_10k_targets_for_cik(
     start_dt: _dt.date | None = _parse_date_yyyy_mm_dd(start_date) if start_date else None
 
     refs: list[FilingRef] = []
+    seen: set[str] = set()  # de-dup by accession
     for form_type in forms:
         start = 0
         while True:
@@ -824,9 +1223,7 @@ def collect_10k_targets_for_cik(
                 f"&type={form_type}&owner=exclude&count={int(page_size)}&start={int(start)}"
             )
             html = sec_get_text(session, url, rate_limiter=rate_limiter)
-            parser = _CompanyFilingsParser()
-            parser.feed(html)
-            rows = parser.filings
+            rows = _parse_company_filings(html)
             if not rows:
                 break
 
@@ -843,6 +1240,9 @@ def collect_10k_targets_for_cik(
                         oldest_on_page = fd
                     if fd < start_dt:
                         continue
+                if accession_no in seen:
+                    continue
+                seen.add(accession_no)
                 refs.append(
                     FilingRef(
                         cik10=cik10,
@@ -862,16 +1262,69 @@ def collect_10k_targets_for_cik(
                 break
             start += int(page_size)
 
-    # de-dup by accession
-    seen: set[str] = set()
-    deduped: list[FilingRef] = []
-    for r in refs:
-        if r.accession_no in seen:
-            continue
-        seen.add(r.accession_no)
-        deduped.append(r)
-    deduped.sort(key=lambda x: (x.filing_date, x.accession_no))
-    return deduped
+    refs.sort(key=lambda x: (x.filing_date, x.accession_no))
+    return refs
+
+
+def collect_10k_targets_from_efts(
+    session: requests.Session,
+    cik10: str,
+    *,
+    include_amendments: bool,
+    rate_limiter: RateLimiter,
+    start_date: str | None = None,
+    max_hits: int = 10000,
+) -> list[FilingRef]:
+    """
+    Collect 10-K (and optionally 10-K/A) filings for a company via EDGAR full-text search (JSON).
+
+    EFTS only indexes 2001+, so callers must not rely on it for older start dates. Hits are
+    per document (_id is "{accession}:{filename}"); they are grouped by accession and the
+    document whose file_type equals the form becomes primary_document.
+    """
+    wanted_forms = {"10-K"}
+    if include_amendments:
+        wanted_forms.add("10-K/A")
+
+    query = f"{SEC_EFTS_BASE}?q=&forms={','.join(sorted(wanted_forms))}&ciks={cik10}"
+    if start_date:
+        start_dt = _parse_date_yyyy_mm_dd(start_date)
+        query += f"&dateRange=custom&startdt={start_dt.isoformat()}&enddt={_dt.date.today().isoformat()}"
+
+    by_acc: dict[str, FilingRef] = {}
+    offset = 0
+    while True:
+        root = sec_get_json(session, f"{query}&from={offset}", rate_limiter=rate_limiter)
+        hits_root = root.get("hits") or {}
+        hits = hits_root.get("hits") or []
+        for h in hits:
+            src = h.get("_source") or {}
+            accession_no = src.get("adsh") or ""
+            form = (src.get("form") or "").strip()
+            filing_date = src.get("file_date") or ""
+            if not accession_no or not filing_date or form not in wanted_forms:
+                continue
+            doc = ""
+            hit_id = h.get("_id") or ""
+            if ":" in hit_id and (src.get("file_type") or "").strip().upper() == form:
+                doc = hit_id.split(":", 1)[1]
+            prev = by_acc.get(accession_no)
+            if prev is None or (doc and not prev.primary_document):
+                by_acc[accession_no] = FilingRef(
+                    cik10=cik10,
+                    accession_no=accession_no,
+                    filing_date=filing_date,
+                    form=form,
+                    primary_document=doc,
+                )
+        total = int((hits_root.get("total") or {}).get("value") or 0)
+        offset += len(hits)
+        if not hits or offset >= min(total, int(max_hits)):
+            break
+
+    refs = list(by_acc.values())
+    refs.sort(key=lambda x: (x.filing_date, x.accession_no))
+    return refs
 
 
 def get_filing_index_items(
@@ -899,72 +1352,104 @@ class _EdgarIndexParser(HTMLParser):
         self._in_table = False
         self._in_row = False
         self._in_cell = False
-        self._cell_text = ""
+        self._cell_text: list[str] = []
         self._cells: list[str] = []
         self._row_has_th = False
         self._doc_col_idx: Optional[int] = None
         self._type_col_idx: Optional[int] = None
         self.rows: list[tuple[str, str]] = []
+        # Per-tag handlers; every other tag is a single dict miss.
+        self._start_handlers = {
+            "table": self._start_table,
+            "tr": self._start_tr,
+            "td": self._start_cell,
+            "th": self._start_cell,
+        }
+        self._end_handlers = {
+            "table": self._end_table,
+            "tr": self._end_tr,
+            "td": self._end_cell,
+            "th": self._end_cell,
+        }
 
     def handle_starttag(self, tag: str, attrs) -> None:
-        if tag == "table":
-            attr_map = {k: v for k, v in attrs}
-            if (attr_map.get("class") or "").lower().find("tablefile") >= 0:
-                self._in_table = True
-        if self._in_table and tag == "tr":
+        h = self._start_handlers.get(tag)
+        if h is not None:
+            h(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        h = self._end_handlers.get(tag)
+        if h is not None:
+            h()
+
+    def _start_table(self, tag: str, attrs) -> None:
+        attr_map = {k: v for k, v in attrs}
+        if (attr_map.get("class") or "").lower().find("tablefile") >= 0:
+            self._in_table = True
+
+    def _start_tr(self, tag: str, attrs) -> None:
+        if self._in_table:
             self._in_row = True
             self._cells = []
             self._row_has_th = False
-        if self._in_row and tag in ("td", "th"):
+
+    def _start_cell(self, tag: str, attrs) -> None:
+        if self._in_row:
             self._in_cell = True
-            self._cell_text = ""
+            self._cell_text = []
             if tag == "th":
                 self._row_has_th = True
 
-    def handle_endtag(self, tag: str) -> None:
-        if tag == "table" and self._in_table:
-            self._in_table = False
-        if tag == "tr" and self._in_row:
-            self._in_row = False
-            # Header row: detect column indices for 'Document' and 'Type'
-            if self._row_has_th and self._cells:
-                lower = [c.strip().lower() for c in self._cells]
-                # Common layouts:
-                # - Seq | Description | Document | Type | Size
-                # - Document | Description | Type | Size
-                if "document" in lower:
-                    self._doc_col_idx = lower.index("document")
-                if "type" in lower:
-                    self._type_col_idx = lower.index("type")
-                return
+    def _end_table(self) -> None:
+        self._in_table = False
 
-            # Data row
-            if not self._cells:
-                return
-            doc_idx = self._doc_col_idx
-            type_idx = self._type_col_idx
-            if doc_idx is None or type_idx is None:
-                # Fallback to the old assumption (best-effort)
-                if len(self._cells) >= 3:
-                    doc = self._cells[0].strip()
-                    typ = self._cells[2].strip()
-                else:
-                    return
-            else:
-                if doc_idx >= len(self._cells) or type_idx >= len(self._cells):
-                    return
-                doc = self._cells[doc_idx].strip()
-                typ = self._cells[type_idx].strip()
+    def _end_tr(self) -> None:
+        if not self._in_row:
+            return
+        self._in_row = False
+        # Header row: detect column indices for 'Document' and 'Type'
+        if self._row_has_th and self._cells:
+            lower = [c.strip().lower() for c in self._cells]
+            # Common layouts:
+            # - Seq | Description | Document | Type | Size
+            # - Document | Description | Type | Size
+            if "document" in lower:
+                self._doc_col_idx = lower.index("document")
+            if "type" in lower:
+                self._type_col_idx = lower.index("type")
+            return
 
-            if doc and doc.lower() != "document":
-                self.rows.append((doc, typ))
-        if tag in ("td", "th") and self._in_cell:
+        self._emit_row()
+
+    def _end_cell(self) -> None:
+        if self._in_cell:
             self._in_cell = False
-            self._cells.append(re.sub(r"\s+", " ", self._cell_text).strip())
+            self._cells.append(_WS_RE.sub(" ", "".join(self._cell_text)).strip())
+
+    def _emit_row(self) -> None:
+        """Append (document, type) for the data row just closed, if it has one."""
+        if not self._cells:
+            return
+        doc_idx = self._doc_col_idx
+        type_idx = self._type_col_idx
+        if doc_idx is None or type_idx is None:
+            # Fallback to the old assumption (best-effort)
+            if len(self._cells) < 3:
+                return
+            doc = self._cells[0].strip()
+            typ = self._cells[2].strip()
+        else:
+            if max(doc_idx, type_idx) >= len(self._cells):
+                return
+            doc = self._cells[doc_idx].strip()
+            typ = self._cells[type_idx].strip()
+
+        if doc and doc.lower() != "document":
+            self.rows.append((doc, typ))
 
     def handle_data(self, data: str) -> None:
         if self._in_cell:
-            self._cell_text += data
+            self._cell_text.append(data)
 
 
 class _CompanyFilingsParser(HTMLParser):
@@ -986,126 +1471,326 @@ class _CompanyFilingsParser(HTMLParser):
         self._in_table = False
         self._in_row = False
         self._in_cell = False
-        self._cell_text = ""
+        self._cell_text: list[str] = []
         self._cells: list[str] = []
         self._hrefs: list[str] = []
         self.filings: list[tuple[str, str, str]] = []  # (form, filing_date, accession_no)
+        # Per-tag handlers; every other tag is a single dict miss.
+        self._start_handlers = {
+            "table": self._start_table,
+            "tr": self._start_tr,
+            "td": self._start_cell,
+            "th": self._start_cell,
+            "a": self._start_a,
+        }
+        self._end_handlers = {
+            "table": self._end_table,
+            "tr": self._end_tr,
+            "td": self._end_cell,
+            "th": self._end_cell,
+        }
 
     def handle_starttag(self, tag: str, attrs) -> None:
-        if tag == "table":
-            attr_map = {k: v for k, v in attrs}
-            cls = (attr_map.get("class") or "").lower()
-            if "tablefile2" in cls:
-                self._in_table = True
-        if self._in_table and tag == "tr":
+        h = self._start_handlers.get(tag)
+        if h is not None:
+            h(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        h = self._end_handlers.get(tag)
+        if h is not None:
+            h()
+
+    def _start_table(self, tag: str, attrs) -> None:
+        attr_map = {k: v for k, v in attrs}
+        cls = (attr_map.get("class") or "").lower()
+        if "tablefile2" in cls:
+            self._in_table = True
+
+    def _start_tr(self, tag: str, attrs) -> None:
+        if self._in_table:
             self._in_row = True
             self._cells = []
             self._hrefs = []
-        if self._in_row and tag in ("td", "th"):
+
+    def _start_cell(self, tag: str, attrs) -> None:
+        if self._in_row:
             self._in_cell = True
-            self._cell_text = ""
-        if self._in_cell and tag == "a":
+            self._cell_text = []
+
+    def _start_a(self, tag: str, attrs) -> None:
+        if self._in_cell:
             for k, v in attrs:
                 if k == "href" and v:
                     self._hrefs.append(v)
 
-    def handle_endtag(self, tag: str) -> None:
-        if tag == "table" and self._in_table:
-            self._in_table = False
-        if tag == "tr" and self._in_row:
-            self._in_row = False
-            if not self._cells:
-                return
-            form = (self._cells[0] or "").strip()
-            # header row often has 'Filings' in first cell
-            if not form or form.lower() == "filings":
-                return
+    def _end_table(self) -> None:
+        self._in_table = False
+
+    def _end_tr(self) -> None:
+        if not self._in_row:
+            return
+        self._in_row = False
+        if not self._cells:
+            return
+        form = (self._cells[0] or "").strip()
+        # header row often has 'Filings' in first cell
+        if not form or form.lower() == "filings":
+            return
+
+        date_search = self._DATE_RE.search
+        acc_search = self._ACC_RE.search
+        filing_date = ""
+        for c in self._cells:
+            m = date_search(c or "")
+            if m:
+                filing_date = m.group(1)
+                break
+
+        accession_no = ""
+        for h in self._hrefs:
+            m = acc_search(h or "")
+            if m:
+                accession_no = m.group(1)
+                break
+
+        if form and filing_date and accession_no:
+            self.filings.append((form, filing_date, accession_no))
+
+    def _end_cell(self) -> None:
+        if self._in_cell:
+            self._in_cell = False
+            self._cells.append(_WS_RE.sub(" ", "".join(self._cell_text)).strip())
+
+    def handle_data(self, data: str) -> None:
+        if self._in_cell:
+            self._cell_text.append(data)
+
+
+_XP_TABLEFILE = "//table[contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '%s')]"
 
+
+def _lxml_cell_text(el) -> str:
+    return " ".join(el.text_content().split())
+
+
+def _lxml_filing_index_rows(html: str) -> list[tuple[str, str]]:
+    """lxml version of _EdgarIndexParser: same header detection and column fallback."""
+    root = _lxml_html.fromstring(html)
+    doc_idx: Optional[int] = None
+    type_idx: Optional[int] = None
+    rows: list[tuple[str, str]] = []
+    for table in root.xpath(_XP_TABLEFILE % "tablefile"):
+        for tr in table.iter("tr"):
+            cell_els = [c for c in tr if c.tag in ("td", "th")]
+            if not cell_els:
+                continue
+            cells = [_lxml_cell_text(c) for c in cell_els]
+            if any(c.tag == "th" for c in cell_els):
+                lower = [c.lower() for c in cells]
+                if "document" in lower:
+                    doc_idx = lower.index("document")
+                if "type" in lower:
+                    type_idx = lower.index("type")
+                continue
+            if doc_idx is None or type_idx is None:
+                if len(cells) < 3:
+                    continue
+                doc, typ = cells[0], cells[2]
+            else:
+                if max(doc_idx, type_idx) >= len(cells):
+                    continue
+                doc, typ = cells[doc_idx], cells[type_idx]
+            if doc and doc.lower() != "document":
+                rows.append((doc, typ))
+    return rows
+
+
+def _lxml_company_filings(html: str) -> list[tuple[str, str, str]]:
+    """lxml version of _CompanyFilingsParser."""
+    root = _lxml_html.fromstring(html)
+    date_search = _CompanyFilingsParser._DATE_RE.search
+    acc_search = _CompanyFilingsParser._ACC_RE.search
+    out: list[tuple[str, str, str]] = []
+    for table in root.xpath(_XP_TABLEFILE % "tablefile2"):
+        for tr in table.iter("tr"):
+            cell_els = [c for c in tr if c.tag in ("td", "th")]
+            if not cell_els:
+                continue
+            form = _lxml_cell_text(cell_els[0])
+            if not form or form.lower() == "filings":
+                continue
             filing_date = ""
-            for c in self._cells:
-                m = self._DATE_RE.search(c or "")
+            for c in cell_els:
+                m = date_search(_lxml_cell_text(c))
                 if m:
                     filing_date = m.group(1)
                     break
-
             accession_no = ""
-            for h in self._hrefs:
-                m = self._ACC_RE.search(h or "")
-                if m:
-                    accession_no = m.group(1)
+            for c in cell_els:
+                for href in c.xpath(".//a/@href"):
+                    m = acc_search(href)
+                    if m:
+                        accession_no = m.group(1)
+                        break
+                if accession_no:
                     break
+            if filing_date and accession_no:
+                out.append((form, filing_date, accession_no))
+    return out
 
-            if form and filing_date and accession_no:
-                self.filings.append((form, filing_date, accession_no))
 
-        if tag in ("td", "th") and self._in_cell:
-            self._in_cell = False
-            self._cells.append(re.sub(r"\s+", " ", self._cell_text).strip())
+# Textual prefilter for the tables the parsers read, a superset of their class checks
+# ("tablefile" also matches tableFile2, as in _EdgarIndexParser).
+_TABLEFILE_RE = re.compile(r"<table\b[^>]*tablefile[^>]*>.*?</table\s*>", re.IGNORECASE | re.DOTALL)
+_TABLEFILE2_RE = re.compile(r"<table\b[^>]*tablefile2[^>]*>.*?</table\s*>", re.IGNORECASE | re.DOTALL)
 
-    def handle_data(self, data: str) -> None:
-        if self._in_cell:
-            self._cell_text += data
 
+def _slice_tables(html: str, table_re: re.Pattern[str]) -> str:
+    """Just the matching <table> elements (whole page if none match), so the parsers skip the rest."""
+    parts = table_re.findall(html)
+    return "".join(parts) if parts else html
 
-def _choose_index_html_name(items: list[dict], accession_no: str) -> Optional[str]:
-    candidates = {f"{accession_no}-index.html", f"{accession_no}-index.htm", "index.html", "index.htm"}
-    names = [it.get("name") for it in items if it.get("name")]
-    for c in candidates:
-        if c in names:
-            return c
-    for n in names:
-        if isinstance(n, str) and (n.endswith("-index.html") or n.endswith("-index.htm")):
-            return n
-    return None
 
+def _parse_filing_index_rows(html: str) -> list[tuple[str, str]]:
+    """(document, type) rows of a filing index page; lxml when installed, else HTMLParser."""
+    html = _slice_tables(html, _TABLEFILE_RE)
+    if _lxml_html is not None and html.strip():
+        try:
+            return _lxml_filing_index_rows(html)
+        except Exception:
+            pass
+    parser = _EdgarIndexParser()
+    parser.feed(html)
+    return parser.rows
 
-def _list_primary_ex_htm_files(
+
+_TR_RE = re.compile(r"<tr\b[^>]*>(.*?)</tr\s*>", re.IGNORECASE | re.DOTALL)
+_CELL_RE = re.compile(r"<t[dh]\b[^>]*>(.*?)</t[dh]\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def _regex_company_filings(tables_html: str) -> list[tuple[str, str, str]]:
+    """
+    Regex version of _CompanyFilingsParser for already-sliced tableFile2 tables.
+
+    browse-edgar rows are regular: form in the first cell, the first YYYY-MM-DD in the row text
+    is the filing date, and the accession comes from the row's "{accession}-index.htm" link.
+    """
+    date_search = _CompanyFilingsParser._DATE_RE.search
+    acc_search = _CompanyFilingsParser._ACC_RE.search
+    tag_sub = _TAG_RE.sub
+    out: list[tuple[str, str, str]] = []
+    for row in _TR_RE.findall(tables_html):
+        cells = _CELL_RE.findall(row)
+        if not cells:
+            continue
+        form = _WS_RE.sub(" ", unescape(tag_sub("", cells[0]))).strip()
+        if not form or form.lower() == "filings":
+            continue
+        m_date = date_search(tag_sub(" ", row))
+        m_acc = acc_search(row)
+        if m_date and m_acc:
+            out.append((form, m_date.group(1), m_acc.group(1)))
+    return out
+
+
+def _parse_company_filings(html: str) -> list[tuple[str, str, str]]:
+    """
+    (form, filing_date, accession_no) rows of a browse-edgar page: a regex over the tableFile2 rows,
+    then lxml when installed, else HTMLParser (for pages the regex finds nothing in).
+    """
+    tables = _TABLEFILE2_RE.findall(html)
+    if tables:
+        html = "".join(tables)
+        rows = _regex_company_filings(html)
+        if rows:
+            return rows
+    if _lxml_html is not None and html.strip():
+        try:
+            return _lxml_company_filings(html)
+        except Exception:
+            pass
+    parser = _CompanyFilingsParser()
+    parser.feed(html)
+    return parser.filings
+
+
+_INDEX_HTML_SUFFIXES = ("-index.html", "-index.htm")
+
+
+def _choose_index_html_name(items: list[dict], accession_no: str) -> Optional[str]:
+    # One pass over the directory: exact names by rank (returning as soon as the best one is seen),
+    # else the first *-index.htm(l).
+    exact = {f"{accession_no}-index.html": 0, f"{accession_no}-index.htm": 1, "index.html": 2, "index.htm": 3}
+    best_rank = len(exact)
+    best: Optional[str] = None
+    fallback: Optional[str] = None
+    for it in items:
+        n = it.get("name")
+        if not isinstance(n, str):
+            continue
+        rank = exact.get(n)
+        if rank is not None:
+            if rank == 0:
+                return n
+            if rank < best_rank:
+                best_rank, best = rank, n
+        elif fallback is None and n.endswith(_INDEX_HTML_SUFFIXES):
+            fallback = n
+    return best or fallback
+
+
+def _fetch_filing_index_rows(
     session: requests.Session,
     filing: FilingRef,
     *,
     rate_limiter: RateLimiter,
-) -> list[str]:
-    items = get_filing_index_items(session, filing, rate_limiter=rate_limiter)
+) -> list[tuple[str, str]]:
+    """
+    Return (document, type) rows from the filing index HTML page.
+
+    EDGAR serves {accession}-index.htm for every filing, so it is requested directly (one request).
+    Only if that page is missing do we list the directory (index.json) to find the index page name.
+    """
     cik_int = cik_to_int_str(filing.cik10)
     base_url = f"{SEC_ARCHIVES_BASE}/edgar/data/{cik_int}/{filing.accession_dir}"
+    try:
+        html = sec_get_text(session, f"{base_url}/{filing.accession_no}-index.htm", rate_limiter=rate_limiter)
+    except requests.exceptions.HTTPError:
+        items = get_filing_index_items(session, filing, rate_limiter=rate_limiter)
+        index_name = _choose_index_html_name(items, filing.accession_no)
+        if not index_name:
+            raise RuntimeError(f"Cannot locate filing index HTML for accession {filing.accession_no}")
+        html = sec_get_text(session, f"{base_url}/{index_name}", rate_limiter=rate_limiter)
+    return _parse_filing_index_rows(html)
 
-    index_name = _choose_index_html_name(items, filing.accession_no)
-    if not index_name:
-        raise RuntimeError(f"Cannot locate filing index HTML for accession {filing.accession_no}")
 
-    html = sec_get_text(session, f"{base_url}/{index_name}", rate_limiter=rate_limiter)
-    parser = _EdgarIndexParser()
-    parser.feed(html)
+def _list_primary_ex_htm_files(
+    session: requests.Session,
+    filing: FilingRef,
+    *,
+    rate_limiter: RateLimiter,
+) -> list[str]:
+    index_rows = _fetch_filing_index_rows(session, filing, rate_limiter=rate_limiter)
+    # safe_filename / upper() once per row; dict keys keep order and dedup.
+    rows = [(safe_filename(doc), (typ or "").strip().upper()) for doc, typ in index_rows]
 
-    wanted: list[str] = []
+    out: dict[str, None] = {}
     primary = safe_filename(filing.primary_document)
     if primary and primary.lower().endswith(".htm"):
-        wanted.append(primary)
+        out[primary] = None
     else:
         # Older filings may not have primaryDocument from submissions JSON.
         # Fall back to the filing index table row whose Type is 10-K/10-K/A, and keep only .htm.
-        for doc, typ in parser.rows:
-            doc = safe_filename(doc)
-            t = (typ or "").strip().upper()
+        for doc, t in rows:
             if t in ("10-K", "10-K/A") and doc.lower().endswith(".htm"):
-                wanted.append(doc)
+                out[doc] = None
                 break
 
-    for doc, typ in parser.rows:
-        doc = safe_filename(doc)
-        if not doc.lower().endswith(".htm"):
-            continue
-        if typ.upper().startswith("EX-"):
-            wanted.append(doc)
-
-    seen: set[str] = set()
-    out: list[str] = []
-    for n in wanted:
-        if n in seen:
-            continue
-        seen.add(n)
-        out.append(n)
-    return out
+    for doc, t in rows:
+        if t.startswith("EX-") and doc.lower().endswith(".htm"):
+            out[doc] = None
+    return list(out)
 
 
 def _list_10k_ex_files(
@@ -1120,35 +1805,17 @@ def _list_10k_ex_files(
     - rows whose Type starts with EX- (all exhibits)
     No extension restriction.
     """
-    items = get_filing_index_items(session, filing, rate_limiter=rate_limiter)
-    cik_int = cik_to_int_str(filing.cik10)
-    base_url = f"{SEC_ARCHIVES_BASE}/edgar/data/{cik_int}/{filing.accession_dir}"
-
-    index_name = _choose_index_html_name(items, filing.accession_no)
-    if not index_name:
-        raise RuntimeError(f"Cannot locate filing index HTML for accession {filing.accession_no}")
-
-    html = sec_get_text(session, f"{base_url}/{index_name}", rate_limiter=rate_limiter)
-    parser = _EdgarIndexParser()
-    parser.feed(html)
+    index_rows = _fetch_filing_index_rows(session, filing, rate_limiter=rate_limiter)
 
-    wanted: list[str] = []
-    for doc, typ in parser.rows:
+    out: dict[str, None] = {}
+    for doc, typ in index_rows:
         doc = safe_filename(doc)
         t = (typ or "").strip().upper()
         if not doc:
             continue
         if t in ("10-K", "10-K/A") or t.startswith("EX-"):
-            wanted.append(doc)
-
-    seen: set[str] = set()
-    out: list[str] = []
-    for n in wanted:
-        if n in seen:
-            continue
-        seen.add(n)
-        out.append(n)
-    return out
+            out[doc] = None
+    return list(out)
 
 
 def download_filing(
@@ -1159,62 +1826,113 @@ def download_filing(
     rate_limiter: RateLimiter,
     save_manifest: bool,
     download_mode: str = "all",
+    executor: Executor | None = None,
 ) -> tuple[FilingRef, int]:
-    base_dir = out_dir / filing.cik10 / f"{filing.filing_date}_{filing.accession_no}"
-    base_dir.mkdir(parents=True, exist_ok=True)
+    """
+    Download one filing's files into out_dir/<cik10>/<date>_<accession>/.
 
-    # Write a small manifest for quick lookup
+    With an executor, the filing's files are fetched concurrently (each request still goes
+    through rate_limiter). The executor must not be the one running download_filing itself.
+    """
+    base_dir = out_dir / filing.cik10 / f"{filing.filing_date}_{filing.accession_no}"
+    base_dir_str = os.fspath(base_dir)
+    filelist_path = base_dir / f".{download_mode}.filelist"
+    # Rerun/resume: a complete earlier run of this mode needs no SEC requests at all.
+    done_names = _read_filelist(filelist_path)
+    if not done_names:
+        base_dir.mkdir(parents=True, exist_ok=True)
+
+    # Write a small manifest for quick lookup (also for filings completed by an earlier run)
     if save_manifest and download_mode == "all":
         manifest_path = base_dir / "manifest.json"
         if not manifest_path.exists():
-            manifest_path.write_text(
-                json.dumps(
-                    {
-                        "cik": filing.cik10,
-                        "accessionNumber": filing.accession_no,
-                        "filingDate": filing.filing_date,
-                        "form": filing.form,
-                        "primaryDocument": filing.primary_document,
-                    },
-                    ensure_ascii=False,
-                    indent=2,
-                ),
-                encoding="utf-8",
-            )
+            manifest_path.write_bytes(_filing_manifest_bytes(filing))
+
+    if done_names:
+        return filing, len(done_names)
 
     cik_int = cik_to_int_str(filing.cik10)
-    base_url = f"{SEC_ARCHIVES_BASE}/edgar/data/{cik_int}/{filing.accession_dir}"
+    # Plain string prefixes for the per-file URL / path builds below.
+    base_url_slash = f"{SEC_ARCHIVES_BASE}/edgar/data/{cik_int}/{filing.accession_dir}/"
+    base_dir_sep = base_dir_str + os.sep
 
-    downloaded = 0
     if download_mode == "8k_ex":
         names = _list_10k_ex_files(session, filing, rate_limiter=rate_limiter)
-        for name in names:
-            url = f"{base_url}/{name}"
-            target = base_dir / name
-            sec_download_file(session, url, target, rate_limiter=rate_limiter)
-            downloaded += 1
     elif download_mode == "primary_ex_htm":
         names = _list_primary_ex_htm_files(session, filing, rate_limiter=rate_limiter)
-        for name in names:
-            url = f"{base_url}/{name}"
-            target = base_dir / name
-            sec_download_file(session, url, target, rate_limiter=rate_limiter)
-            downloaded += 1
     else:
         items = get_filing_index_items(session, filing, rate_limiter=rate_limiter)
-        for it in items:
-            name = it.get("name")
-            if not name:
-                continue
-            name = safe_filename(name)
-            url = f"{base_url}/{name}"
-            target = base_dir / name
-            sec_download_file(session, url, target, rate_limiter=rate_limiter)
+        names = [safe_filename(it["name"]) for it in items if it.get("name")]
+
+    downloaded = 0
+    if executor is not None and len(names) > 1:
+        futs = [
+            executor.submit(
+                sec_download_file, session, base_url_slash + name, base_dir_str, name, rate_limiter=rate_limiter
+            )
+            for name in names
+        ]
+        for fut in futs:
+            fut.result()
+            downloaded += 1
+    else:
+        for name in names:
+            sec_download_file(session, base_url_slash + name, base_dir_str, name, rate_limiter=rate_limiter)
             downloaded += 1
 
+    # Only files that exist are recorded (listed-but-404 files are skipped by sec_download_file).
+    # No sidecar when nothing was saved (e.g. an index layout the parsers did not recognise),
+    # so the filing is listed again next run instead of being skipped forever.
+    present = [n for n in names if os.path.isfile(base_dir_sep + n)]
+    if present:
+        _write_cache_file(filelist_path, "\n".join(present).encode("utf-8"))
     return filing, downloaded
 
 
+def _filing_manifest_bytes(filing: FilingRef) -> bytes:
+    """manifest.json content: 2-space indented JSON of the filing's fields."""
+    if _orjson is not None:
+        return _orjson.dumps(
+            {
+                "cik": filing.cik10,
+                "accessionNumber": filing.accession_no,
+                "filingDate": filing.filing_date,
+                "form": filing.form,
+                "primaryDocument": filing.primary_document,
+            },
+            option=_orjson.OPT_INDENT_2,
+        )
+    # Fixed shape: format it directly instead of the stdlib's pure-Python indent encoder.
+    # json.dumps escapes each value (C encoder); output is identical to indent=2.
+    q = functools.partial(json.dumps, ensure_ascii=False)
+    return (
+        f'{{\n  "cik": {q(filing.cik10)},\n  "accessionNumber": {q(filing.accession_no)},\n'
+        f'  "filingDate": {q(filing.filing_date)},\n  "form": {q(filing.form)},\n'
+        f'  "primaryDocument": {q(filing.primary_document)}\n}}'
+    ).encode("utf-8")
+
+
+def _read_filelist(path: Path) -> list[str] | None:
+    """
+    Names written by a previous complete download_filing() run, or None when the sidecar is
+    missing/empty or any listed file is gone/empty (the filing is then fetched again).
+    """
+    try:
+        names = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    if not names:
+        return None
+    base = os.fspath(path.parent)
+    for name in names:
+        try:
+            if os.stat(os.path.join(base, name)).st_size <= 0:
+                return None
+        except OSError:
+            return None
+    return names
+
+
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Download SEC EDGAR Form 10-K filings (primary + all attachments).")
     p.add_argument("--ciks", nargs="*", default=None, help="CIK list (e.g. 0000320193 0001652044).")
@@ -1261,8 +1979,18 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="When --source master_index: build targets + write manifest, then exit without downloading.",
     )
-    p.add_argument("--min-interval", type=float, default=0.2, help="Minimum seconds between SEC requests (global).")
-    p.add_argument("--max-workers", type=int, default=3, help="Parallel download workers across filings.")
+    p.add_argument(
+        "--http2",
+        action="store_true",
+        help='Use an HTTP/2 client (requires: python -m pip install "httpx[http2]").',
+    )
+    p.add_argument("--min-interval", type=float, default=0.2, help="Minimum seconds between SEC requests (per SEC host).")
+    p.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Parallel download workers across filings (requests are still paced by --min-interval).",
+    )
     p.add_argument("--save-manifest", action="store_true", help="Write manifest.json per filing folder.")
     return p.parse_args(argv)
 
@@ -1291,6 +2019,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         targets_manifest=args.targets_manifest,
         reuse_targets_manifest=bool(args.reuse_targets_manifest),
         manifest_only=bool(args.manifest_only),
+        http2=bool(args.http2),
         min_interval=float(args.min_interval),
         max_workers=int(args.max_workers),
         save_manifest=bool(args.save_manifest),
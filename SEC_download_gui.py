@@ -6,21 +6,20 @@ Windows friendly: paste CIKs or load from a file, set output folder and User-Age
 
 from __future__ import annotations
 
+import queue
 import re
 import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, scrolledtext, ttk
+from typing import Callable
 
-from SEC_download import iter_ciks_from_file, run_download
+from SEC_download import iter_ciks_from_file, run_download, split_ciks_text
 
 
-def _split_ciks_text(text: str) -> list[str]:
-    # allow comma/space/newline separated
-    import re
-
-    toks = re.split(r"[\s,]+", (text or "").strip())
-    return [t for t in toks if t]
+# Expected prefix from core runner: "[idx/total] ..."
+_PROGRESS_RE = re.compile(r"^\[(\d+)/(\d+)\]\s+")
+_COMPANIES_DONE_RE = re.compile(r"\bcompanies_done=(\d+)")
 
 
 class App(tk.Tk):
@@ -80,6 +79,10 @@ class App(tk.Tk):
         mcb = ttk.Checkbutton(opt_frame, text="每筆存 manifest.json（此模式不輸出）", variable=self.save_manifest_var)
         mcb.pack(anchor="w", padx=8, pady=(0, 6))
         mcb.state(["disabled"])
+        self.http2_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opt_frame, text="使用 HTTP/2（需安裝 httpx[http2]）", variable=self.http2_var).pack(
+            anchor="w", padx=8, pady=(0, 6)
+        )
 
         tun_frame = ttk.Frame(opt_frame)
         tun_frame.pack(fill=tk.X, padx=8, pady=(0, 8))
@@ -87,7 +90,7 @@ class App(tk.Tk):
         self.min_interval_var = tk.DoubleVar(value=0.25)
         ttk.Entry(tun_frame, width=10, textvariable=self.min_interval_var).pack(side=tk.LEFT, padx=(6, 18))
         ttk.Label(tun_frame, text="max-workers:").pack(side=tk.LEFT)
-        self.max_workers_var = tk.IntVar(value=2)
+        self.max_workers_var = tk.IntVar(value=8)
         ttk.Entry(tun_frame, width=10, textvariable=self.max_workers_var).pack(side=tk.LEFT, padx=(6, 0))
 
         date_frame = ttk.Frame(opt_frame)
@@ -111,8 +114,11 @@ class App(tk.Tk):
         log_frame.pack(fill=tk.BOTH, expand=True)
         self.log_text = scrolledtext.ScrolledText(log_frame, height=16, wrap=tk.WORD, state=tk.NORMAL)
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        # Worker-thread log lines are queued and flushed in batches (one Text insert per tick).
+        self._log_queue: queue.Queue[str] = queue.Queue()
         self._log("Ready.")
         self.update_cik_count()
+        self.after(50, self._drain_log)
 
     def _log(self, msg: str) -> None:
         self._update_company_progress_from_log(msg)
@@ -120,20 +126,42 @@ class App(tk.Tk):
         self.log_text.see(tk.END)
 
     def _log_threadsafe(self, msg: str) -> None:
-        self.after(0, lambda: self._log(msg))
+        self._log_queue.put(msg)
+
+    def _drain_log(self) -> None:
+        self._flush_log()
+        self.after(50, self._drain_log)
+
+    def _flush_log(self) -> None:
+        # Main thread only. Also called right before dialogs so the log is complete when they open.
+        msgs: list[str] = []
+        try:
+            while True:
+                msgs.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if msgs:
+            for msg in msgs:
+                self._update_company_progress_from_log(msg)
+            self.log_text.insert(tk.END, "\n".join(msgs) + "\n")
+            self.log_text.see(tk.END)
+
+    def _show_dialog_after_log(self, show: Callable[[str, str], object], title: str, text: str) -> None:
+        self._flush_log()
+        show(title, text)
 
     def _update_company_progress_from_log(self, msg: str) -> None:
-        # Expected prefix from core runner: "[idx/total] ..."
-        m = re.match(r"^\[(\d+)/(\d+)\]\s+", msg)
+        m = _PROGRESS_RE.match(msg)
         if not m:
             return
-        idx = int(m.group(1))
         total = int(m.group(2))
 
-        # When we're scanning company idx, previous companies are done (idx-1).
-        done = idx - 1
-        if "COMPANY_DONE" in msg:
-            done = idx
+        # Downloads of earlier companies may still be running while company idx is scanned,
+        # so only COMPANY_DONE lines (which carry the runner's own counter) move progress.
+        if "COMPANY_DONE" not in msg:
+            return
+        m_done = _COMPANIES_DONE_RE.search(msg)
+        done = int(m_done.group(1)) if m_done else int(m.group(1))
         left = max(0, total - done)
         self.company_progress_var.set(f"公司進度：{done}/{total}（剩 {left}）")
 
@@ -142,7 +170,7 @@ class App(tk.Tk):
         self.update_cik_count()
 
     def update_cik_count(self) -> None:
-        ciks = _split_ciks_text(self.cik_text.get("1.0", tk.END))
+        ciks = split_ciks_text(self.cik_text.get("1.0", tk.END))
         self.cik_count_var.set(f"CIK 數量：{len(ciks)}")
 
     def load_cik_file(self) -> None:
@@ -179,7 +207,7 @@ class App(tk.Tk):
 
         ua = self.ua_var.get().strip()
         out_dir = self.out_var.get().strip()
-        ciks = _split_ciks_text(self.cik_text.get("1.0", tk.END))
+        ciks = split_ciks_text(self.cik_text.get("1.0", tk.END))
 
         if not ua:
             messagebox.showerror("缺少資訊", "請輸入 User-Agent（建議含 email）。")
@@ -196,6 +224,7 @@ class App(tk.Tk):
         start_date = self.start_date_var.get().strip()
         min_interval = float(self.min_interval_var.get())
         max_workers = int(self.max_workers_var.get())
+        http2 = bool(self.http2_var.get())
 
         total_companies = len(ciks)
         self.company_progress_var.set(f"公司進度：0/{total_companies}（剩 {total_companies}）")
@@ -215,12 +244,15 @@ class App(tk.Tk):
                     max_workers=max_workers,
                     save_manifest=save_manifest,
                     download_mode="primary_ex_htm",
+                    http2=http2,
                     log=self._log_threadsafe,
                 )
-                self.after(0, lambda: messagebox.showinfo("完成", f"完成！ok={summary['ok']} failed={summary['failed']}\n輸出：{summary['out']}"))
+                done_text = f"完成！ok={summary['ok']} failed={summary['failed']}\n輸出：{summary['out']}"
+                self.after(0, lambda: self._show_dialog_after_log(messagebox.showinfo, "完成", done_text))
             except Exception as e:
                 self._log_threadsafe(f"ERROR: {e}")
-                self.after(0, lambda: messagebox.showerror("失敗", str(e)))
+                err_text = str(e)
+                self.after(0, lambda: self._show_dialog_after_log(messagebox.showerror, "失敗", err_text))
             finally:
                 self.after(0, lambda: self._set_running(False))
 